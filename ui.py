@@ -82,8 +82,11 @@ def init_db():
 
             CREATE INDEX IF NOT EXISTS idx_courses_user    ON courses(user_id);
             CREATE INDEX IF NOT EXISTS idx_sessions_user   ON study_sessions(user_id);
-            CREATE INDEX IF NOT EXISTS idx_sessions_course ON study_sessions(course_id);
             CREATE INDEX IF NOT EXISTS idx_sessions_date   ON study_sessions(session_date);
+            CREATE INDEX IF NOT EXISTS idx_sessions_course_date
+                ON study_sessions(course_id, session_date);
+            -- Covered by idx_sessions_course_date's leading column.
+            DROP INDEX IF EXISTS idx_sessions_course;
         """)
 
 
@@ -266,6 +269,22 @@ def list_sessions(user_id: int) -> list[dict]:
     return out
 
 
+def get_session_on(user_id: int, course_id: int,
+                   session_date: dt.date) -> Optional[dict]:
+    """Return one course's session on a given day, if it exists."""
+    with get_connection() as conn:
+        row = conn.execute("""
+            SELECT * FROM study_sessions
+            WHERE user_id = ? AND course_id = ? AND session_date = ?
+            ORDER BY id LIMIT 1
+        """, (user_id, course_id, session_date.isoformat())).fetchone()
+    if not row:
+        return None
+    d = dict(row)
+    d["session_date"] = dt.date.fromisoformat(d["session_date"])
+    return d
+
+
 def replace_sessions(user_id: int, sessions: list[dict]):
     """Replace the generated plan."""
     with get_connection() as conn:
@@ -296,6 +315,19 @@ def update_session_planned(user_id: int, session_id: int, planned_minutes: int):
         )
 
 
+def update_sessions_planned(user_id: int, planned: dict[int, int]):
+    """Set planned minutes for several sessions in one transaction."""
+    if not planned:
+        return
+    with get_connection() as conn:
+        conn.executemany(
+            """UPDATE study_sessions SET planned_minutes = ?
+               WHERE id = ? AND user_id = ?""",
+            [(max(0, int(minutes)), int(session_id), user_id)
+             for session_id, minutes in planned.items()],
+        )
+
+
 def update_session_completed(user_id: int, session_id: int, completed_minutes: int):
     with get_connection() as conn:
         conn.execute(
@@ -322,21 +354,28 @@ def insert_session(user_id: int, course_id: int, session_date: dt.date,
         return cur.lastrowid
 
 
-def delete_session(user_id: int, session_id: int):
+def delete_sessions(user_id: int, session_ids: list[int]):
+    if not session_ids:
+        return
     with get_connection() as conn:
-        conn.execute(
+        conn.executemany(
             "DELETE FROM study_sessions WHERE id = ? AND user_id = ?",
-            (session_id, user_id),
+            [(int(session_id), user_id) for session_id in session_ids],
         )
 
 
-def has_plan(user_id: int) -> bool:
+def session_totals(user_id: int) -> Optional[tuple[int, int]]:
+    """Return (planned, completed) minutes, or None when there is no plan."""
     with get_connection() as conn:
         row = conn.execute(
-            "SELECT 1 FROM study_sessions WHERE user_id = ? LIMIT 1",
+            """SELECT COUNT(*), COALESCE(SUM(planned_minutes), 0),
+                      COALESCE(SUM(completed_minutes), 0)
+               FROM study_sessions WHERE user_id = ?""",
             (user_id,),
         ).fetchone()
-        return row is not None
+    if not row[0]:
+        return None
+    return int(row[1]), int(row[2])
 
 
 def clear_user_data(user_id: int):